@@ -1,31 +1,114 @@
+import asyncio
+import functools
+import hashlib
+import multiprocessing
+import os
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Body
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from cachetools import TTLCache
 import uvicorn
-from typing import Optional
+from typing import List, Optional
 from password_utils import (
-    generate_random_password,
-    generate_passphrase,
     generate_pin,
     check_password_strength,
     hash_password,
     validate_password_rules,
-    generate_name_based_password
+    generate_scored_password,
+    generate_scored_passphrase,
+    generate_scored_name_based_password
 )
 
+# Upper bound on passwords returned by a single batch request
+MAX_BATCH_SIZE = 20
+
+# Memoised /check-strength results, held in the API process so one cache
+# serves every worker. Keys are BLAKE2b digests under a per-process secret,
+# so neither plaintext nor a dictionary-crackable hash of it is retained.
+STRENGTH_CACHE = TTLCache(maxsize=4096, ttl=300)
+_CACHE_KEY = secrets.token_bytes(32)
+
+# CPU-bound work (zxcvbn scoring, generation loops) runs on the event loop's
+# default thread executor. USE_PROCESS_POOL=1 moves it to a worker process
+# pool instead; leave it unset on serverless hosts (vercel.json), where
+# lifespan may not run and multiprocessing has no shared memory to work with.
+USE_PROCESS_POOL = os.environ.get("USE_PROCESS_POOL", "").lower() in ("1", "true", "yes")
+
+POOL: Optional[ProcessPoolExecutor] = None
+
+def new_pool() -> ProcessPoolExecutor:
+    """Start a worker pool, spawning workers rather than forking uvicorn's threaded process"""
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global POOL
+    if USE_PROCESS_POOL:
+        POOL = new_pool()
+    try:
+        yield
+    finally:
+        if POOL is not None:
+            POOL.shutdown(wait=False, cancel_futures=True)
+            POOL = None
+
+async def run_in_pool(func, *args, **kwargs):
+    """Run a blocking function off the event loop, in the worker pool if started"""
+    global POOL
+    pool = POOL
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, functools.partial(func, *args, **kwargs))
+    except BrokenProcessPool:
+        # A dead worker leaves the pool unusable for good; swap in a fresh one
+        # (once, however many requests saw it break) so later calls recover
+        if pool is not None and POOL is pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+            POOL = new_pool()
+        raise
+
+async def gather_batch(calls):
+    """Run batch items concurrently, keeping successes and reporting failures per item"""
+    outcomes = await asyncio.gather(*calls, return_exceptions=True)
+    for outcome in outcomes:
+        if isinstance(outcome, BrokenProcessPool):
+            raise outcome
+    results = [outcome for outcome in outcomes if not isinstance(outcome, BaseException)]
+    errors = [str(outcome) for outcome in outcomes if isinstance(outcome, BaseException)]
+    if not results:
+        raise ValueError(errors[0])
+    return {"results": results, "errors": errors}
+
 app = FastAPI(
     title="Password Generator API",
     description="A secure password generation and validation API with name-based options",
-    version="1.2.0"
+    version="1.2.0",
+    lifespan=lifespan
 )
 
-# CORS configuration
+# CORS configuration: explicit origins (comma-separated in CORS_ORIGINS)
+# and cached preflights. The Streamlit frontend calls the API server-side,
+# so only browser clients need to be listed here.
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get("CORS_ORIGINS", "http://localhost:8501").split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Accept"],
+    max_age=86400,
 )
 
 # Define all models first to avoid circular references
@@ -47,6 +130,9 @@ class PasswordRequest(BaseModel):
     name_part1: Optional[str] = None
     name_part2: Optional[str] = None
 
+class BatchPasswordRequest(PasswordRequest):
+    count: int = 5
+
 class PassphraseRequest(BaseModel):
     word_count: int = 4
     separator: str = "-"
@@ -55,9 +141,15 @@ class PassphraseRequest(BaseModel):
     name_part1: Optional[str] = None
     name_part2: Optional[str] = None
 
+class BatchPassphraseRequest(PassphraseRequest):
+    count: int = 5
+
 class PinRequest(BaseModel):
     length: int = 6
 
+class BatchPinRequest(PinRequest):
+    count: int = 5
+
 class NameBasedRequest(BaseModel):
     name_part1: str
     name_part2: str = ""
@@ -72,6 +164,49 @@ class ValidationRequest(BaseModel):
     password: str
     rules: ValidationRules
 
+# Response models: with these declared, FastAPI serializes responses
+# straight to JSON bytes through Pydantic
+class StrengthFeedback(BaseModel):
+    warning: str
+    suggestions: List[str]
+
+class StrengthResponse(BaseModel):
+    score: int
+    feedback: StrengthFeedback
+    crack_time: str
+    guesses: int
+
+class PasswordResponse(BaseModel):
+    password: str
+    strength: StrengthResponse
+
+class BatchPasswordResponse(BaseModel):
+    results: List[PasswordResponse]
+    # One message per item that failed; the rest are still in results
+    errors: List[str] = []
+
+class PassphraseResponse(BaseModel):
+    passphrase: str
+    strength: StrengthResponse
+
+class BatchPassphraseResponse(BaseModel):
+    results: List[PassphraseResponse]
+    errors: List[str] = []
+
+class PinResponse(BaseModel):
+    pin: str
+
+class BatchPinResponse(BaseModel):
+    results: List[PinResponse]
+    errors: List[str] = []
+
+class ValidationResponse(BaseModel):
+    is_valid: bool
+    errors: List[str]
+
+class HashResponse(BaseModel):
+    hash: str
+
 # Endpoints
 @app.get("/")
 def read_root():
@@ -81,10 +216,11 @@ def read_root():
 def health_check():
     return {"status": "healthy"}
 
-@app.post("/generate/password")
-def generate_password(options: PasswordRequest):
+@app.post("/generate/password", response_model=PasswordResponse)
+async def generate_password(options: PasswordRequest):
     try:
-        password = generate_random_password(
+        return await run_in_pool(
+            generate_scored_password,
             length=options.length,
             include_uppercase=options.include_uppercase,
             include_lowercase=options.include_lowercase,
@@ -93,18 +229,39 @@ def generate_password(options: PasswordRequest):
             exclude_similar=options.exclude_similar,
             exclude_ambiguous=options.exclude_ambiguous
         )
-        strength = check_password_strength(password)
-        return {
-            "password": password,
-            "strength": strength
-        }
+    except BrokenProcessPool:
+        raise HTTPException(status_code=503, detail="Worker pool restarted, please retry")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/generate/password/batch", response_model=BatchPasswordResponse)
+async def generate_password_batch(options: BatchPasswordRequest):
+    try:
+        if not 1 <= options.count <= MAX_BATCH_SIZE:
+            raise ValueError(f"Count must be between 1 and {MAX_BATCH_SIZE}")
+        return await gather_batch(
+            run_in_pool(
+                generate_scored_password,
+                length=options.length,
+                include_uppercase=options.include_uppercase,
+                include_lowercase=options.include_lowercase,
+                include_digits=options.include_digits,
+                include_special=options.include_special,
+                exclude_similar=options.exclude_similar,
+                exclude_ambiguous=options.exclude_ambiguous
+            )
+            for _ in range(options.count)
+        )
+    except BrokenProcessPool:
+        raise HTTPException(status_code=503, detail="Worker pool restarted, please retry")
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.post("/generate/passphrase")
-def generate_passphrase_endpoint(options: PassphraseRequest):
+@app.post("/generate/passphrase", response_model=PassphraseResponse)
+async def generate_passphrase_endpoint(options: PassphraseRequest):
     try:
-        passphrase = generate_passphrase(
+        return await run_in_pool(
+            generate_scored_passphrase,
             word_count=options.word_count,
             separator=options.separator,
             capitalize=options.capitalize,
@@ -112,15 +269,34 @@ def generate_passphrase_endpoint(options: PassphraseRequest):
             name_part1=options.name_part1,
             name_part2=options.name_part2
         )
-        strength = check_password_strength(passphrase)
-        return {
-            "passphrase": passphrase,
-            "strength": strength
-        }
+    except BrokenProcessPool:
+        raise HTTPException(status_code=503, detail="Worker pool restarted, please retry")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/generate/passphrase/batch", response_model=BatchPassphraseResponse)
+async def generate_passphrase_batch(options: BatchPassphraseRequest):
+    try:
+        if not 1 <= options.count <= MAX_BATCH_SIZE:
+            raise ValueError(f"Count must be between 1 and {MAX_BATCH_SIZE}")
+        return await gather_batch(
+            run_in_pool(
+                generate_scored_passphrase,
+                word_count=options.word_count,
+                separator=options.separator,
+                capitalize=options.capitalize,
+                add_number=options.add_number,
+                name_part1=options.name_part1,
+                name_part2=options.name_part2
+            )
+            for _ in range(options.count)
+        )
+    except BrokenProcessPool:
+        raise HTTPException(status_code=503, detail="Worker pool restarted, please retry")
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.post("/generate/pin")
+@app.post("/generate/pin", response_model=PinResponse)
 def generate_pin_endpoint(options: PinRequest):
     try:
         pin = generate_pin(options.length)
@@ -128,39 +304,64 @@ def generate_pin_endpoint(options: PinRequest):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.post("/generate/name-based")
-def generate_name_based(options: NameBasedRequest):
+@app.post("/generate/pin/batch", response_model=BatchPinResponse)
+def generate_pin_batch(options: BatchPinRequest):
+    try:
+        if not 1 <= options.count <= MAX_BATCH_SIZE:
+            raise ValueError(f"Count must be between 1 and {MAX_BATCH_SIZE}")
+        return {
+            "results": [{"pin": generate_pin(options.length)} for _ in range(options.count)],
+            "errors": []
+        }
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/generate/name-based", response_model=PasswordResponse)
+async def generate_name_based(options: NameBasedRequest):
     try:
-        password = generate_name_based_password(
+        return await run_in_pool(
+            generate_scored_name_based_password,
             name_part1=options.name_part1,
             name_part2=options.name_part2,
             length=options.length,
             complexity=options.complexity,
             include_random=options.include_random
         )
-        strength = check_password_strength(password)
-        return {
-            "password": password,
-            "strength": strength
-        }
+    except BrokenProcessPool:
+        raise HTTPException(status_code=503, detail="Worker pool restarted, please retry")
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.post("/check-strength")
-def check_strength(request: PasswordCheckRequest):
+@app.post("/check-strength", response_model=StrengthResponse)
+async def check_strength(request: PasswordCheckRequest):
     try:
-        return check_password_strength(request.password)
+        key = hashlib.blake2b(request.password.encode('utf-8'), key=_CACHE_KEY).digest()
+        strength = STRENGTH_CACHE.get(key)
+        if strength is None:
+            strength = await run_in_pool(check_password_strength, request.password)
+            STRENGTH_CACHE[key] = strength
+        return strength
+    except BrokenProcessPool:
+        raise HTTPException(status_code=503, detail="Worker pool restarted, please retry")
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.post("/validate")
+@app.post("/validate", response_model=ValidationResponse)
 def validate_password(request: ValidationRequest):
     try:
-        return validate_password_rules(request.password, request.rules.dict())
+        rules = request.rules
+        return validate_password_rules(
+            request.password,
+            min_length=rules.min_length,
+            require_upper=rules.require_upper,
+            require_lower=rules.require_lower,
+            require_digit=rules.require_digit,
+            require_special=rules.require_special
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.post("/hash")
+@app.post("/hash", response_model=HashResponse)
 def hash_password_endpoint(password: str, algorithm: str = "sha256"):
     try:
         return {"hash": hash_password(password, algorithm)}
@@ -1,11 +1,99 @@
 import random
 import string
 import secrets
-import re
 import hashlib
+import functools
 import zxcvbn
+import blake3
 from typing import Optional
 
+# CSPRNG-backed Random for shuffles that must not leak character positions
+_SR = secrets.SystemRandom()
+
+# Supported hash_password algorithms, resolved to their constructors once:
+# every fixed-length hashlib digest (shake_* need an output length), using the
+# named constructor where hashlib has one and hashlib.new for OpenSSL extras
+_HASHERS = {
+    name: getattr(hashlib, name, None) or functools.partial(hashlib.new, name)
+    for name in hashlib.algorithms_available
+    if not name.startswith("shake_")
+}
+# BLAKE3 is a fast fingerprinting hash, not a password-storage KDF
+_HASHERS["blake3"] = blake3.blake3
+
+# Character classes used by validate_password_rules
+_UPPER_SET = frozenset(string.ascii_uppercase)
+_LOWER_SET = frozenset(string.ascii_lowercase)
+_DIGIT_SET = frozenset(string.digits)
+_ALNUM_SET = _UPPER_SET | _LOWER_SET | _DIGIT_SET
+
+# Longest PIN generate_pin will produce
+_MAX_PIN_LENGTH = 64
+
+# Word list for generate_passphrase
+_WORDS = (
+    "apple", "banana", "carrot", "dog", "elephant", "flower", "giraffe",
+    "house", "igloo", "jungle", "kangaroo", "lion", "mountain", "night",
+    "ocean", "penguin", "queen", "river", "sun", "tree", "umbrella",
+    "volcano", "water", "xylophone", "yacht", "zebra"
+)
+
+def _build_charsets(mask: int) -> tuple:
+    """Filtered character sets for one combination of generator flags"""
+    character_sets = []
+    
+    if mask & 1:
+        character_sets.append(string.ascii_lowercase)
+    if mask & 2:
+        character_sets.append(string.ascii_uppercase)
+    if mask & 4:
+        character_sets.append(string.digits)
+    if mask & 8:
+        character_sets.append(string.punctuation)
+    
+    # Characters to exclude
+    excluded_chars = ""
+    if mask & 16:
+        excluded_chars += "l1Io0O"
+    if mask & 32:
+        excluded_chars += "{}[]()/\\'\"`~,;:.<>"
+    
+    # Filter character sets
+    filtered_sets = []
+    for charset in character_sets:
+        filtered = [c for c in charset if c not in excluded_chars]
+        if filtered:
+            filtered_sets.append(''.join(filtered))
+    
+    return tuple(filtered_sets), ''.join(filtered_sets)
+
+# All 64 flag combinations of generate_random_password, keyed by bitmask
+_CHARSET_CACHE = {mask: _build_charsets(mask) for mask in range(64)}
+
+def _secure_choices(population, k: int) -> list:
+    """Pick k items uniformly from population using bulk CSPRNG reads"""
+    n = len(population)
+    if not 0 < n <= 256:
+        raise ValueError("Population must contain between 1 and 256 items")
+    # Bytes at or above this bound would bias the modulo, so they are rejected
+    limit = 256 - 256 % n
+    picks = []
+    while len(picks) < k:
+        raw = secrets.token_bytes(k - len(picks) + 8)
+        picks.extend(population[b % n] for b in raw if b < limit)
+    return picks[:k]
+
+# Filler characters for name-based passwords shorter than the requested length
+_PADDING_CHARS = string.ascii_letters + string.digits + string.punctuation
+
+# Level-1 substitutions applied by transform_name
+_NAME_LEET_TABLE = str.maketrans({'a': '@', 'e': '3', 'i': '!'})
+
+def _random_upper(text: str, probability: float = 0.3) -> str:
+    """Uppercase each character independently with the given probability"""
+    flags = random.choices((True, False), weights=(probability, 1 - probability), k=len(text))
+    return ''.join(c.upper() if flag else c for c, flag in zip(text, flags))
+
 def transform_name(name_part: str, level: int = 2) -> str:
     """Transform name parts with different security levels"""
     if not name_part:
@@ -15,20 +103,26 @@ def transform_name(name_part: str, level: int = 2) -> str:
     
     # Level 1: Basic transformations (still somewhat recognizable)
     if level >= 1:
-        transformed = transformed.replace('a', '@').replace('e', '3').replace('i', '!')
+        transformed = transformed.translate(_NAME_LEET_TABLE)
     
     # Level 2: Moderate transformations (less recognizable)
     if level >= 2:
         if len(transformed) > 2:
-            # Reverse every other character
-            transformed = ''.join([c if i % 2 == 0 else transformed[i-1] for i, c in enumerate(reversed(transformed))])
+            # Reverse every other character: even slots take the reversed
+            # string, odd slots take the original's even-indexed characters
+            chars = list(transformed)
+            chars[::2] = transformed[::-1][::2]
+            chars[1::2] = transformed[:-1:2]
+            transformed = ''.join(chars)
         # Add random capitalization
-        transformed = ''.join(c.upper() if random.random() > 0.7 else c for c in transformed)
+        transformed = _random_upper(transformed)
     
     # Level 3: Heavy transformations (barely recognizable)
     if level >= 3:
-        transformed = ''.join(random.choice('@#$%&*+-=_') + c for c in transformed)
-        transformed = transformed[-12:]  # Keep last 12 characters
+        # Only the last 6 symbol+char pairs survive the 12-character cut
+        tail = transformed[-6:]
+        symbols = random.choices('@#$%&*+-=_', k=len(tail))
+        transformed = ''.join(sym + c for sym, c in zip(symbols, tail))
     
     return transformed
 
@@ -64,10 +158,7 @@ def generate_name_based_password(
         transformed_word = ''.join(vowel_map.get(c, c) for c in word_part)
         # Capitalize random letters
         if complexity >= 3:
-            transformed_word = ''.join(
-                c.upper() if random.random() > 0.7 else c 
-                for c in transformed_word
-            )
+            transformed_word = _random_upper(transformed_word)
     else:
         transformed_word = word_part.capitalize()
 
@@ -77,9 +168,9 @@ def generate_name_based_password(
     # Add random characters if requested
     if include_random:
         # Add 2-4 random digits
-        digits = ''.join(random.choice(string.digits) for _ in range(random.randint(2,4)))
+        digits = ''.join(_secure_choices(string.digits, _SR.randint(2, 4)))
         # Add 1-2 special characters
-        specials = ''.join(random.choice('!@#$%&*+-=_') for _ in range(random.randint(1,2)))
+        specials = ''.join(_secure_choices('!@#$%&*+-=_', _SR.randint(1, 2)))
         password += digits + specials
 
     # Ensure length requirement
@@ -87,17 +178,24 @@ def generate_name_based_password(
         password = password[:length]
     elif len(password) < length:
         # Add extra random characters if too short
-        extra = ''.join(random.choice(string.ascii_letters + string.digits + string.punctuation) 
-                     for _ in range(length - len(password)))
+        extra = ''.join(_secure_choices(_PADDING_CHARS, length - len(password)))
         password += extra
 
     # Final shuffle for security
     password_list = list(password)
-    random.shuffle(password_list)
+    _SR.shuffle(password_list)
     password = ''.join(password_list)
 
     return password
 
+def generate_scored_name_based_password(**options) -> dict:
+    """Generate a name-based password and its strength in one call (one worker round-trip)"""
+    password = generate_name_based_password(**options)
+    return {
+        "password": password,
+        "strength": check_password_strength(password)
+    }
+
 def generate_random_password(
     length: int = 12,
     include_uppercase: bool = True,
@@ -108,48 +206,40 @@ def generate_random_password(
     exclude_ambiguous: bool = True
 ) -> str:
     """Generate a random password with customizable parameters"""
-    character_sets = []
+    mask = (
+        include_lowercase
+        | include_uppercase << 1
+        | include_digits << 2
+        | include_special << 3
+        | exclude_similar << 4
+        | exclude_ambiguous << 5
+    )
+    filtered_sets, all_chars = _CHARSET_CACHE[mask]
     
-    if include_lowercase:
-        character_sets.append(string.ascii_lowercase)
-    if include_uppercase:
-        character_sets.append(string.ascii_uppercase)
-    if include_digits:
-        character_sets.append(string.digits)
-    if include_special:
-        character_sets.append(string.punctuation)
-    
-    if not character_sets:
+    if not filtered_sets:
         raise ValueError("At least one character set must be included")
     
-    # Characters to exclude
-    excluded_chars = ""
-    if exclude_similar:
-        excluded_chars += "l1Io0O"
-    if exclude_ambiguous:
-        excluded_chars += "{}[]()/\\'\"`~,;:.<>"
-    
-    # Filter character sets
-    filtered_sets = []
-    for charset in character_sets:
-        filtered = [c for c in charset if c not in excluded_chars]
-        if filtered:
-            filtered_sets.append(''.join(filtered))
-    
     password = []
     # Ensure at least one character from each selected set
     for charset in filtered_sets:
         password.append(secrets.choice(charset))
     
     # Fill the rest of the password
-    all_chars = ''.join(filtered_sets)
-    password.extend(secrets.choice(all_chars) for _ in range(length - len(password)))
+    password.extend(_secure_choices(all_chars, length - len(password)))
     
     # Shuffle to avoid predictable patterns
-    random.shuffle(password)
+    _SR.shuffle(password)
     
     return ''.join(password)
 
+def generate_scored_password(**options) -> dict:
+    """Generate a random password and its strength in one call (one worker round-trip)"""
+    password = generate_random_password(**options)
+    return {
+        "password": password,
+        "strength": check_password_strength(password)
+    }
+
 def generate_passphrase(
     word_count: int = 4,
     separator: str = "-",
@@ -159,14 +249,7 @@ def generate_passphrase(
     name_part2: Optional[str] = None
 ) -> str:
     """Generate a memorable passphrase with optional name parts"""
-    words = [
-        "apple", "banana", "carrot", "dog", "elephant", "flower", "giraffe",
-        "house", "igloo", "jungle", "kangaroo", "lion", "mountain", "night",
-        "ocean", "penguin", "queen", "river", "sun", "tree", "umbrella",
-        "volcano", "water", "xylophone", "yacht", "zebra"
-    ]
-    
-    selected_words = [secrets.choice(words) for _ in range(word_count)]
+    selected_words = _secure_choices(_WORDS, word_count)
     
     # Add transformed name parts if provided
     if name_part1:
@@ -184,11 +267,22 @@ def generate_passphrase(
     
     return passphrase
 
+def generate_scored_passphrase(**options) -> dict:
+    """Generate a passphrase and its strength in one call (one worker round-trip)"""
+    passphrase = generate_passphrase(**options)
+    return {
+        "passphrase": passphrase,
+        "strength": check_password_strength(passphrase)
+    }
+
 def generate_pin(length: int = 6) -> str:
     """Generate a numeric PIN"""
     if length < 4:
         raise ValueError("PIN length should be at least 4 digits")
-    return ''.join(secrets.choice(string.digits) for _ in range(length))
+    if length > _MAX_PIN_LENGTH:
+        raise ValueError(f"PIN length should be at most {_MAX_PIN_LENGTH} digits")
+    # One uniform draw over all length-digit values, zero-padded
+    return f"{secrets.randbelow(10 ** length):0{length}d}"
 
 def check_password_strength(password: str) -> dict:
     """Check password strength using zxcvbn"""
@@ -197,32 +291,45 @@ def check_password_strength(password: str) -> dict:
         "score": result["score"],
         "feedback": result["feedback"],
         "crack_time": result["crack_times_display"]["offline_slow_hashing_1e4_per_second"],
-        "guesses": result["guesses"]
+        # zxcvbn counts guesses as a Decimal; hand back the exact int
+        "guesses": int(result["guesses"])
     }
 
 def hash_password(password: str, algorithm: str = "sha256") -> str:
     """Hash a password using the specified algorithm"""
-    hasher = hashlib.new(algorithm)
-    hasher.update(password.encode('utf-8'))
-    return hasher.hexdigest()
+    hasher = _HASHERS.get(algorithm)
+    if hasher is None:
+        raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+    return hasher(password.encode('utf-8')).hexdigest()
 
-def validate_password_rules(password: str, rules: dict) -> dict:
+def validate_password_rules(
+    password: str,
+    min_length: Optional[int] = None,
+    require_upper: Optional[bool] = None,
+    require_lower: Optional[bool] = None,
+    require_digit: Optional[bool] = None,
+    require_special: Optional[bool] = None
+) -> dict:
     """Validate password against specific rules"""
     errors = []
     
-    if rules.get("min_length") and len(password) < rules["min_length"]:
-        errors.append(f"Password too short (min {rules['min_length']} chars)")
+    if min_length and len(password) < min_length:
+        errors.append(f"Password too short (min {min_length} chars)")
+    
+    # One set build, then C-level membership checks per rule
+    chars = set(password)
     
-    if rules.get("require_upper") and not re.search(r'[A-Z]', password):
+    if require_upper and chars.isdisjoint(_UPPER_SET):
         errors.append("Password must contain uppercase letters")
     
-    if rules.get("require_lower") and not re.search(r'[a-z]', password):
+    if require_lower and chars.isdisjoint(_LOWER_SET):
         errors.append("Password must contain lowercase letters")
     
-    if rules.get("require_digit") and not re.search(r'[0-9]', password):
+    if require_digit and chars.isdisjoint(_DIGIT_SET):
         errors.append("Password must contain digits")
     
-    if rules.get("require_special") and not re.search(r'[^a-zA-Z0-9]', password):
+    # Anything outside ASCII letters and digits counts as special
+    if require_special and chars <= _ALNUM_SET:
         errors.append("Password must contain special characters")
     
     return {
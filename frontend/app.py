@@ -1,14 +1,23 @@
 import streamlit as st
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import time
-import pyperclip
-import matplotlib.pyplot as plt
+import threading
+import collections
+import string
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Configuration - UPDATE THIS WITH YOUR RENDER BACKEND URL
 BACKEND_URL = "https://backend-password.vercel.app/"
 
+# (connect, read) timeouts so a hung backend can't stall the script
+REQUEST_TIMEOUT = (3.05, 10)
+
+# Number of generated passwords kept in the session history
+HISTORY_SIZE = 200
+
 # Page setup
 st.set_page_config(
     page_title="Advanced Password Creator",
@@ -16,96 +25,240 @@ st.set_page_config(
     layout="wide"
 )
 
-# Session state initialization
-if 'password_history' not in st.session_state:
-    st.session_state.password_history = []
-if 'api_response_time' not in st.session_state:
-    st.session_state.api_response_time = []
-if 'api_errors' not in st.session_state:
+# Session state initialization, done once per session so reruns
+# (every keystroke in the strength checker) cost a single key probe
+if 'initialized' not in st.session_state:
+    # One bounded column per field, newest first
+    st.session_state.password_history = {
+        column: collections.deque(maxlen=HISTORY_SIZE)
+        for column in ("timestamp", "type", "value", "strength", "crack_time")
+    }
+    st.session_state.strength_counter = collections.Counter()
+    st.session_state.api_response_time = collections.deque(maxlen=500)
+    st.session_state.api_response_time_sum = 0.0
     st.session_state.api_errors = 0
+    st.session_state.initialized = True
+
+# Shared keep-alive session, reused across reruns and generation loops;
+# failed connects and transient 5xx are retried on the pooled connection
+@st.cache_resource
+def get_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=2,
+            connect=2,
+            # A read timeout means the backend is still working on it; resending
+            # would only stack another expensive request behind the first.
+            # False (not 0) re-raises the original ReadTimeout unwrapped.
+            read=False,
+            status=2,
+            backoff_factor=0.2,
+            status_forcelist=(500, 502, 503, 504),
+            # Connect failures and 5xx are safe to repeat, including the POSTs
+            allowed_methods=frozenset(["GET", "POST"]),
+            # Hand the last response back so handle_response can report it
+            raise_on_status=False
+        )
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "Content-Type": "application/json",
+        "Accept": "application/json"
+    })
+    return session
 
-def call_api(endpoint, payload=None):
+# Opens a pooled connection (and wakes the backend) once per app process,
+# so the first Generate click doesn't pay for the handshake. The probe runs
+# on a daemon thread so a down backend (and its retries) never blocks a page load.
+def ping_backend(session):
+    try:
+        session.get(f"{BACKEND_URL}/health", timeout=1.0)
+    except requests.exceptions.RequestException:
+        pass
+
+@st.cache_resource(show_spinner=False)
+def warm_backend():
+    thread = threading.Thread(target=ping_backend, args=(get_session(),), daemon=True)
+    thread.start()
+    return thread
+
+warm_backend()
+
+# Returned by call_api for a 404 when the caller can fall back quietly
+ENDPOINT_MISSING = object()
+
+def record_response_time(response_time):
+    # Keep a running sum alongside the bounded window so the average is O(1)
+    times = st.session_state.api_response_time
+    if len(times) == times.maxlen:
+        st.session_state.api_response_time_sum -= times[0]
+    times.append(response_time)
+    st.session_state.api_response_time_sum += response_time
+
+def send_request(session, endpoint, payload=None):
+    # Network I/O only (no st.* calls), so it can run on worker threads
+    start_time = time.time()
     try:
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
-        
-        start_time = time.time()
-        
         if payload:
-            response = requests.post(
+            response = session.post(
                 f"{BACKEND_URL}{endpoint}",
                 json=payload,
-                headers=headers,
-                timeout=10
+                timeout=REQUEST_TIMEOUT
             )
         else:
-            response = requests.get(
+            response = session.get(
                 f"{BACKEND_URL}{endpoint}",
-                headers=headers,
-                timeout=10
+                timeout=REQUEST_TIMEOUT
             )
-        
-        response_time = time.time() - start_time
-        st.session_state.api_response_time.append(response_time)
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            st.session_state.api_errors += 1
-            st.error(f"API Error {response.status_code}: {response.text}")
-            return None
+    except requests.exceptions.RequestException as e:
+        return e, None
+    return response, time.time() - start_time
+
+def error_detail(response):
+    # Parse the error body once; non-JSON or unexpected bodies fall back to a short excerpt
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    if isinstance(body, dict) and "detail" in body:
+        return body["detail"]
+    return response.text[:200]
+
+def handle_response(response, response_time, missing_ok=False):
+    if isinstance(response, requests.exceptions.Timeout):
+        st.session_state.api_errors += 1
+        st.error(f"Request timed out: {str(response)}")
+        return None
+    if isinstance(response, requests.exceptions.RequestException):
+        st.session_state.api_errors += 1
+        st.error(f"Connection error: {str(response)}")
+        return None
+    
+    record_response_time(response_time)
+    
+    try:
+        if missing_ok and response.status_code == 404:
+            return ENDPOINT_MISSING
+        response.raise_for_status()
+        return response.json()
+    except requests.exceptions.HTTPError:
+        st.session_state.api_errors += 1
+        st.error(f"API Error {response.status_code}: {error_detail(response)}")
+        return None
     except requests.exceptions.RequestException as e:
         st.session_state.api_errors += 1
         st.error(f"Connection error: {str(e)}")
         return None
 
+def call_api(endpoint, payload=None, missing_ok=False):
+    response, response_time = send_request(get_session(), endpoint, payload)
+    return handle_response(response, response_time, missing_ok)
+
+class ApiCallFailed(Exception):
+    # Raised inside cached calls so failed lookups are never memoised
+    pass
+
+@st.cache_data(ttl=300, max_entries=512, show_spinner=False)
+def _cached_call_api(endpoint, payload):
+    result = call_api(endpoint, payload)
+    if result is None:
+        raise ApiCallFailed(endpoint)
+    return result
+
+# Read-only lookups (strength check, validation) keyed by their payload
+def cached_call_api(endpoint, payload):
+    try:
+        return _cached_call_api(endpoint, payload)
+    except ApiCallFailed:
+        return None
+
+def generate_batch(endpoint, payload, count):
+    # One round-trip for all results; backends without /batch get
+    # concurrent single calls, rendered once all have returned
+    batch = call_api(f"{endpoint}/batch", {**payload, "count": count}, missing_ok=True)
+    if batch is ENDPOINT_MISSING:
+        session = get_session()
+        with ThreadPoolExecutor(max_workers=min(count, 8)) as executor:
+            outcomes = list(executor.map(
+                lambda _: send_request(session, endpoint, payload),
+                range(count)
+            ))
+        results = [handle_response(*outcome) for outcome in outcomes]
+        return [result for result in results if result]
+    if not batch:
+        return []
+    # Items that failed server-side are reported alongside the successes
+    for message in batch.get("errors", []):
+        st.session_state.api_errors += 1
+        st.error(f"API Error: {message}")
+    return batch["results"]
+
 def add_to_history(password_data, password_type="Password"):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     password_value = password_data.get("password") or password_data.get("passphrase") or password_data.get("pin")
-    st.session_state.password_history.insert(0, {
-        "timestamp": timestamp,
-        "type": password_type,
-        "value": password_value,
-        "strength": password_data.get("strength", {}).get("score", 0),
-        "crack_time": password_data.get("strength", {}).get("crack_time", "N/A")
-    })
-
-def display_strength_meter(score):
-    colors = ["#ff0000", "#ff4000", "#ff8000", "#ffbf00", "#ffff00", "#bfff00", "#80ff00", "#40ff00", "#00ff00"]
-    width = (score + 1) * 10 if score is not None else 0
+    score = password_data.get("strength", {}).get("score", 0)
+    history = st.session_state.password_history
+    
+    # Keep the strength tally in step with the bounded history
+    counter = st.session_state.strength_counter
+    if len(history["strength"]) == HISTORY_SIZE:
+        evicted = history["strength"][-1]
+        counter[evicted] -= 1
+        if not counter[evicted]:
+            del counter[evicted]
+    counter[score] += 1
     
-    st.markdown(f"""
+    history["timestamp"].appendleft(timestamp)
+    history["type"].appendleft(password_type)
+    history["value"].appendleft(password_value)
+    history["strength"].appendleft(score)
+    history["crack_time"].appendleft(password_data.get("strength", {}).get("crack_time", "N/A"))
+
+# Strength meter markup; only the bar width and label vary per call
+METER_COLORS = ["#ff0000", "#ff4000", "#ff8000", "#ffbf00", "#ffff00", "#bfff00", "#80ff00", "#40ff00", "#00ff00"]
+METER_LABELS = ("Very Weak", "Weak", "Fair", "Good", "Strong")
+METER_TEMPLATE = string.Template(f"""
     <div style="background-color: #f0f0f0; border-radius: 5px; height: 20px; margin: 10px 0;">
-        <div style="background: linear-gradient(to right, {colors[0]}, {colors[-1]}); 
-                    width: {width}%; height: 100%; border-radius: 5px; 
+        <div style="background: linear-gradient(to right, {METER_COLORS[0]}, {METER_COLORS[-1]}); 
+                    width: $width%; height: 100%; border-radius: 5px; 
                     transition: width 0.5s ease;"></div>
     </div>
     <div style="text-align: center; margin-top: -20px;">
-        {["Very Weak", "Weak", "Fair", "Good", "Strong"][min(score, 4)] if score is not None else "N/A"}
+        $label
     </div>
-    """, unsafe_allow_html=True)
+    """)
+
+# Fully rendered meters for zxcvbn scores 0-4, plus the empty "N/A" meter
+METERS = tuple(METER_TEMPLATE.substitute(width=(score + 1) * 10, label=label) for score, label in enumerate(METER_LABELS))
+METER_NA = METER_TEMPLATE.substitute(width=0, label="N/A")
+
+def display_strength_meter(score):
+    meter = METERS[score] if score is not None and 0 <= score < len(METERS) else METER_NA
+    st.markdown(meter, unsafe_allow_html=True)
 
 def name_input_fields(prefix=""):
     col1, col2 = st.columns(2)
     with col1:
-        name_part1 = st.text_input("First name part (e.g., name, nickname)", key=f"{prefix}name_part1")
+        st.text_input("First name part (e.g., name, nickname)", key=f"{prefix}name_part1")
     with col2:
-        name_part2 = st.text_input("Second name part (e.g., surname, pet name)", key=f"{prefix}name_part2")
-    return name_part1, name_part2
+        st.text_input("Second name part (e.g., surname, pet name)", key=f"{prefix}name_part2")
 
+@st.fragment
 def name_based_password_section():
     st.subheader("Name-Based Password Generator")
     st.markdown("Create memorable passwords using city names + catchy words")
     
     col1, col2 = st.columns(2)
     with col1:
-        city_name = st.text_input("Your Name", 
-                                key="nb_city",
-                                help="Enter a city or location name")
+        st.text_input("Your Name", 
+                      key="nb_city",
+                      help="Enter a city or location name")
         
-        complexity = st.select_slider(
+        st.select_slider(
             "Transformation Complexity",
             options=[1, 2, 3],
             value=2,
@@ -114,20 +267,23 @@ def name_based_password_section():
         )
     
     with col2:
-        catchy_word = st.text_input("Catchy Word or City (e.g., Chicken, Blue, Chennai, Toronto)", 
-                                  key="nb_word",
-                                  help="Enter an animal, color, flower, etc.")
+        st.text_input("Catchy Word or City (e.g., Chicken, Blue, Chennai, Toronto)", 
+                      key="nb_word",
+                      help="Enter an animal, color, flower, etc.")
         
-        include_random = st.checkbox(
+        st.checkbox(
             "Add Random Characters", 
             True,
             help="Adds numbers and special characters for security",
             key="nb_random"
         )
     
-    length = st.slider("Password Length", 8, 32, 14, key="nb_length")
+    st.slider("Password Length", 8, 32, 14, key="nb_length")
     
     if st.button("Generate Name-Based Password", key="nb_generate"):
+        state = st.session_state
+        city_name = state["nb_city"]
+        catchy_word = state["nb_word"]
         if not city_name or not catchy_word:
             st.error("Please enter both a city name and a catchy word")
             return
@@ -135,9 +291,9 @@ def name_based_password_section():
         payload = {
             "name_part1": city_name,
             "name_part2": catchy_word,
-            "length": length,
-            "complexity": complexity,
-            "include_random": include_random
+            "length": state["nb_length"],
+            "complexity": state["nb_complexity"],
+            "include_random": state["nb_random"]
         }
         
         with st.spinner("Creating memorable password..."):
@@ -156,10 +312,108 @@ def name_based_password_section():
                     st.markdown("**Strength Analysis**")
                     display_strength_meter(result['strength']['score'])
                     st.write(f"Estimated crack time: {result['strength']['crack_time']}")
+
+@st.fragment
+def random_password_section():
+    st.subheader("Random Password Generator")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.slider("Password Length", 8, 64, 16, key="pass_length")
+        st.checkbox("Include Uppercase Letters", True, key="pass_upper")
+        st.checkbox("Include Lowercase Letters", True, key="pass_lower")
+        st.checkbox("Include Digits", True, key="pass_digits")
+        st.checkbox("Include Special Characters", True, key="pass_special")
+    
+    with col2:
+        st.checkbox("Exclude Similar Characters (l,1,I,o,0,O)", True, key="pass_similar")
+        st.checkbox("Exclude Ambiguous Characters ({ } [ ] ( ) etc.)", True, key="pass_ambiguous")
+        st.slider("Number of Passwords to Generate", 1, 10, 3, key="pass_num")
+    
+    st.markdown("**Optional: Include name parts**")
+    name_input_fields("pass_")
+    
+    if st.button("Generate Password(s)", key="pass_generate"):
+        state = st.session_state
+        payload = {
+            "length": state["pass_length"],
+            "include_uppercase": state["pass_upper"],
+            "include_lowercase": state["pass_lower"],
+            "include_digits": state["pass_digits"],
+            "include_special": state["pass_special"],
+            "exclude_similar": state["pass_similar"],
+            "exclude_ambiguous": state["pass_ambiguous"],
+            "name_part1": state["pass_name_part1"] or None,
+            "name_part2": state["pass_name_part2"] or None
+        }
+        
+        with st.spinner("Generating secure passwords..."):
+            results = generate_batch("/generate/password", payload, state["pass_num"])
+            for result in results:
+                st.code(result["password"], language="text")
+                add_to_history(result)
+                
+                st.markdown(f"**Strength:** {result['strength']['score']}/4")
+                display_strength_meter(result['strength']['score'])
+                st.markdown(f"**Estimated crack time:** {result['strength']['crack_time']}")
+                st.write("---")
+
+@st.fragment
+def passphrase_section():
+    st.subheader("Passphrase Generator")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.slider("Number of Words", 3, 10, 4, key="phrase_words")
+        st.selectbox("Word Separator", ["-", "_", ".", " ", ""], key="phrase_sep")
+        st.checkbox("Capitalize Words", True, key="phrase_cap")
+        st.checkbox("Add Random Number", True, key="phrase_num")
+        st.slider("Number of Passphrases to Generate", 1, 5, 2, key="phrase_count")
+    
+    st.markdown("**Optional: Include name parts**")
+    name_input_fields("phrase_")
+    
+    if st.button("Generate Passphrase(s)", key="phrase_generate"):
+        state = st.session_state
+        payload = {
+            "word_count": state["phrase_words"],
+            "separator": state["phrase_sep"],
+            "capitalize": state["phrase_cap"],
+            "add_number": state["phrase_num"],
+            "name_part1": state["phrase_name_part1"] or None,
+            "name_part2": state["phrase_name_part2"] or None
+        }
+        
+        with st.spinner("Generating memorable passphrases..."):
+            results = generate_batch("/generate/passphrase", payload, state["phrase_count"])
+            for result in results:
+                st.code(result["passphrase"], language="text")
+                add_to_history(result, "Passphrase")
                 
-                if st.button("Copy to Clipboard", key="nb_copy"):
-                    pyperclip.copy(result["password"])
-                    st.success("Copied to clipboard!")
+                st.markdown(f"**Strength:** {result['strength']['score']}/4")
+                display_strength_meter(result['strength']['score'])
+                st.markdown(f"**Estimated crack time:** {result['strength']['crack_time']}")
+                st.write("---")
+
+@st.fragment
+def pin_section():
+    st.subheader("Numeric PIN Generator")
+    
+    st.slider("PIN Length", 4, 12, 6, key="pin_length")
+    st.slider("Number of PINs to Generate", 1, 10, 3, key="pin_count")
+    
+    if st.button("Generate PIN(s)", key="pin_generate"):
+        state = st.session_state
+        payload = {"length": state["pin_length"]}
+        
+        with st.spinner("Generating secure PINs..."):
+            results = generate_batch("/generate/pin", payload, state["pin_count"])
+            for result in results:
+                st.code(result["pin"], language="text")
+                add_to_history({"pin": result["pin"]}, "PIN")
+                st.write("---")
 
 # Sidebar for navigation
 st.sidebar.title("Navigation")
@@ -176,115 +430,13 @@ if page == "Password Generator":
     ])
     
     with tab1:
-        st.subheader("Random Password Generator")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            length = st.slider("Password Length", 8, 64, 16, key="pass_length")
-            include_upper = st.checkbox("Include Uppercase Letters", True, key="pass_upper")
-            include_lower = st.checkbox("Include Lowercase Letters", True, key="pass_lower")
-            include_digits = st.checkbox("Include Digits", True, key="pass_digits")
-            include_special = st.checkbox("Include Special Characters", True, key="pass_special")
-        
-        with col2:
-            exclude_similar = st.checkbox("Exclude Similar Characters (l,1,I,o,0,O)", True, key="pass_similar")
-            exclude_ambiguous = st.checkbox("Exclude Ambiguous Characters ({ } [ ] ( ) etc.)", True, key="pass_ambiguous")
-            num_passwords = st.slider("Number of Passwords to Generate", 1, 10, 3, key="pass_num")
-        
-        st.markdown("**Optional: Include name parts**")
-        name_part1, name_part2 = name_input_fields("pass_")
-        
-        if st.button("Generate Password(s)", key="pass_generate"):
-            payload = {
-                "length": length,
-                "include_uppercase": include_upper,
-                "include_lowercase": include_lower,
-                "include_digits": include_digits,
-                "include_special": include_special,
-                "exclude_similar": exclude_similar,
-                "exclude_ambiguous": exclude_ambiguous,
-                "name_part1": name_part1 if name_part1 else None,
-                "name_part2": name_part2 if name_part2 else None
-            }
-            
-            with st.spinner("Generating secure passwords..."):
-                for i in range(num_passwords):
-                    result = call_api("/generate/password", payload)
-                    if result:
-                        st.code(result["password"], language="text")
-                        add_to_history(result)
-                        
-                        st.markdown(f"**Strength:** {result['strength']['score']}/4")
-                        display_strength_meter(result['strength']['score'])
-                        st.markdown(f"**Estimated crack time:** {result['strength']['crack_time']}")
-                        
-                        if st.button("Copy to Clipboard", key=f"copy_pass_{i}"):
-                            pyperclip.copy(result["password"])
-                            st.success("Copied to clipboard!")
-                        st.write("---")
+        random_password_section()
     
     with tab2:
-        st.subheader("Passphrase Generator")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            word_count = st.slider("Number of Words", 3, 10, 4, key="phrase_words")
-            separator = st.selectbox("Word Separator", ["-", "_", ".", " ", ""], key="phrase_sep")
-            capitalize = st.checkbox("Capitalize Words", True, key="phrase_cap")
-            add_number = st.checkbox("Add Random Number", True, key="phrase_num")
-            num_passphrases = st.slider("Number of Passphrases to Generate", 1, 5, 2, key="phrase_count")
-        
-        st.markdown("**Optional: Include name parts**")
-        name_part1, name_part2 = name_input_fields("phrase_")
-        
-        if st.button("Generate Passphrase(s)", key="phrase_generate"):
-            payload = {
-                "word_count": word_count,
-                "separator": separator,
-                "capitalize": capitalize,
-                "add_number": add_number,
-                "name_part1": name_part1 if name_part1 else None,
-                "name_part2": name_part2 if name_part2 else None
-            }
-            
-            with st.spinner("Generating memorable passphrases..."):
-                for i in range(num_passphrases):
-                    result = call_api("/generate/passphrase", payload)
-                    if result:
-                        st.code(result["passphrase"], language="text")
-                        add_to_history(result, "Passphrase")
-                        
-                        st.markdown(f"**Strength:** {result['strength']['score']}/4")
-                        display_strength_meter(result['strength']['score'])
-                        st.markdown(f"**Estimated crack time:** {result['strength']['crack_time']}")
-                        
-                        if st.button("Copy to Clipboard", key=f"copy_phrase_{i}"):
-                            pyperclip.copy(result["passphrase"])
-                            st.success("Copied to clipboard!")
-                        st.write("---")
+        passphrase_section()
     
     with tab3:
-        st.subheader("Numeric PIN Generator")
-        
-        length = st.slider("PIN Length", 4, 12, 6, key="pin_length")
-        num_pins = st.slider("Number of PINs to Generate", 1, 10, 3, key="pin_count")
-        
-        if st.button("Generate PIN(s)", key="pin_generate"):
-            payload = {"length": length}
-            
-            with st.spinner("Generating secure PINs..."):
-                for i in range(num_pins):
-                    result = call_api("/generate/pin", payload)
-                    if result:
-                        st.code(result["pin"], language="text")
-                        add_to_history({"pin": result["pin"]}, "PIN")
-                        
-                        if st.button("Copy to Clipboard", key=f"copy_pin_{i}"):
-                            pyperclip.copy(result["pin"])
-                            st.success("Copied to clipboard!")
-                        st.write("---")
+        pin_section()
     
     with tab4:
         name_based_password_section()
@@ -299,7 +451,7 @@ elif page == "Password Strength Checker":
     if st.button("Check Strength") and password:
         with st.spinner("Analyzing password strength..."):
             # Make sure to use the correct endpoint
-            result = call_api("/check-strength", {"password": password})
+            result = cached_call_api("/check-strength", {"password": password})
             
             if result:
                 st.subheader("Strength Analysis")
@@ -355,7 +507,7 @@ elif page == "Password Validator":
         }
         
         with st.spinner("Validating password..."):
-            result = call_api("/validate", payload)
+            result = cached_call_api("/validate", payload)
             if result:
                 if result['is_valid']:
                     st.success("✅ Password meets all requirements!")
@@ -365,36 +517,49 @@ elif page == "Password Validator":
                         st.write(f"- {error}")
 
 elif page == "Performance Metrics":
+    # Only this page needs pandas; other pages skip the import entirely
+    import pandas as pd
+    
     st.title("📊 Performance Metrics")
     
     if st.session_state.api_response_time:
-        avg_response_time = sum(st.session_state.api_response_time) / len(st.session_state.api_response_time)
+        avg_response_time = st.session_state.api_response_time_sum / len(st.session_state.api_response_time)
         st.metric("Average API Response Time", f"{avg_response_time:.3f} seconds")
         
-        fig, ax = plt.subplots()
-        ax.plot(st.session_state.api_response_time, marker='o')
-        ax.set_title("API Response Times")
-        ax.set_xlabel("Request Number")
-        ax.set_ylabel("Response Time (seconds)")
-        st.pyplot(fig)
+        st.subheader("API Response Times")
+        st.line_chart(
+            pd.DataFrame({"response_time": list(st.session_state.api_response_time)}),
+            x_label="Request Number",
+            y_label="Response Time (seconds)"
+        )
     else:
         st.warning("No API response data available yet.")
     
     st.metric("Total API Errors", st.session_state.api_errors)
     
     st.subheader("Password History")
-    if st.session_state.password_history:
-        history_df = pd.DataFrame(st.session_state.password_history)
-        st.dataframe(history_df)
+    history = st.session_state.password_history
+    if history["timestamp"]:
+        # A toggle (unlike an expander) skips the table work entirely while off
+        if st.toggle("Show password history", key="show_history"):
+            history_df = pd.DataFrame({column: list(values) for column, values in history.items()})
+            # Never echo full passwords back into the page
+            history_df["value"] = history_df["value"].str[:2] + "***"
+            st.dataframe(
+                history_df,
+                hide_index=True,
+                column_config={
+                    "timestamp": st.column_config.TextColumn("Generated At"),
+                    "type": st.column_config.TextColumn("Type"),
+                    "value": st.column_config.TextColumn("Value"),
+                    "strength": st.column_config.NumberColumn("Strength", format="%d/4"),
+                    "crack_time": st.column_config.TextColumn("Crack Time")
+                }
+            )
         
-        if not history_df.empty and 'strength' in history_df.columns:
-            strength_counts = history_df['strength'].value_counts().sort_index()
-            fig, ax = plt.subplots()
-            strength_counts.plot(kind='bar', ax=ax)
-            ax.set_title("Password Strength Distribution")
-            ax.set_xlabel("Strength Score")
-            ax.set_ylabel("Count")
-            st.pyplot(fig)
+        strength_counts = pd.Series(dict(sorted(st.session_state.strength_counter.items())))
+        st.subheader("Password Strength Distribution")
+        st.bar_chart(strength_counts, x_label="Strength Score", y_label="Count")
     else:
         st.info("No password generation history yet.")
 